@@ -6,40 +6,124 @@ Stores historical YouTube analytics data for trend analysis and comparisons.
 Allows querying by days since publication, traffic source, etc.
 """
 
+import asyncio
 import sqlite3
 import json
 import os
-from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import chain, islice
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import googleapiclient.discovery
 from google.oauth2.credentials import Credentials
 
-@dataclass
+# orjson is an optional, faster drop-in for the (de)serialization of cached
+# API responses; fall back to the stdlib when it isn't installed
+try:
+    import orjson
+    
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# Store dates as ISO strings and read DATE columns back as date objects
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+
+# Max IDs bound into a single "IN (...)" clause (SQLite allows 999 parameters)
+IN_CLAUSE_CHUNK_SIZE = 900
+
+# Rows per multi-row daily_metrics INSERT (4 parameters per row, 999 max)
+METRICS_INSERT_CHUNK_SIZE = 999 // 4
+
+# Secondary daily_metrics indexes (name -> columns), dropped by bulk_mode()
+DAILY_METRICS_INDEXES = {
+    # Covering index so the first-week aggregation never touches the table itself
+    'idx_daily_metrics_first_week': 'video_id, traffic_source, days_since_published, views',
+}
+
+# Max video IDs per YouTube Data API videos.list request
+DATA_API_BATCH_SIZE = 50
+
+# Video IDs per "video==" filter in a channel-wide Analytics query; keeps each
+# day/video/traffic-source response small enough to come back in one page
+ANALYTICS_FILTER_CHUNK_SIZE = 50
+
+# Days before a cached video title/publish date is re-fetched (titles can be edited)
+VIDEO_METADATA_TTL_DAYS = 30
+
+# Retries for transient API failures (429/5xx, connection errors); the client
+# library backs off exponentially between attempts
+API_NUM_RETRIES = 3
+
+# Videos synced concurrently by sync_videos (kept low to respect API quota)
+SYNC_CONCURRENCY = 5
+
+def days_since_published_sql(date_expr: str, published_date_expr: str) -> str:
+    """SQL expression for whole days between a metric date and a publish date"""
+    return f'CAST(julianday({date_expr}) - julianday({published_date_expr}) AS INTEGER)'
+
+@dataclass(slots=True, frozen=True)
 class VideoInfo:
     video_id: str
     title: str
     published_date: date
     channel_id: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DailyMetric:
     video_id: str
     date: date
-    days_since_published: int
     traffic_source: str
     views: int
+    
+    def as_row(self) -> tuple:
+        """Parameter tuple in the column order store_daily_metrics binds"""
+        return (self.video_id, self.date, self.traffic_source, self.views)
 
 class YouTubeAnalyticsDB:
     def __init__(self, db_path: str = "youtube_analytics.db"):
         self.db_path = db_path
+        # One long-lived connection, reused by every method
+        self._conn = self._connect()
+        # Serializes write transactions when videos are synced from worker threads
+        self._write_lock = threading.Lock()
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection tuning pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MB
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
+        return conn
+    
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
+        # WAL is persistent, so setting it once here covers every later connection
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Videos table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS videos (
@@ -67,114 +151,303 @@ class YouTubeAnalyticsDB:
             )
         ''')
         
+        # Report-side cache of Data API titles and publish dates. Kept apart
+        # from videos, which only holds videos explicitly synced for analysis.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS video_metadata (
+                video_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Raw Analytics API responses for closed date ranges, keyed by a
+        # hash of the query parameters
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS query_cache (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Computed report results, valid until the end of the local day
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS report_cache (
+                cache_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         # Indexes for performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_metrics_video_days ON daily_metrics (video_id, days_since_published)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_metrics_source ON daily_metrics (traffic_source)')
+        self._create_daily_metrics_indexes(cursor)
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (published_date)')
         
+        # days_since_published is derived from videos.published_date at write
+        # time; re-derive it whenever a video's publish date is written
+        days_sql = days_since_published_sql('daily_metrics.date', 'NEW.published_date')
+        for event in ('INSERT', 'UPDATE OF published_date'):
+            trigger_name = 'trg_videos_days_' + event.split()[0].lower()
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger_name}
+                AFTER {event} ON videos
+                BEGIN
+                    UPDATE daily_metrics
+                    SET days_since_published = {days_sql}
+                    WHERE video_id = NEW.video_id
+                    AND days_since_published IS NOT {days_sql};
+                END
+            ''')
+        
+        # Low-cardinality and unused by any query; only slowed down inserts
+        cursor.execute('DROP INDEX IF EXISTS idx_daily_metrics_source')
+        # Redundant: the UNIQUE and covering indexes also lead with video_id
+        cursor.execute('DROP INDEX IF EXISTS idx_daily_metrics_video_days')
+        
         conn.commit()
-        conn.close()
     
-    def get_youtube_analytics_client(self):
-        """Get YouTube Analytics client - import from main module"""
+    def _create_daily_metrics_indexes(self, cursor: sqlite3.Cursor):
+        """Create the secondary daily_metrics indexes if they are missing"""
+        for name, columns in DAILY_METRICS_INDEXES.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON daily_metrics ({columns})')
+    
+    @contextmanager
+    def bulk_mode(self):
+        """Drop secondary daily_metrics indexes for a large ingest
+        
+        The indexes are rebuilt in one pass on exit, which beats updating
+        them row by row. The UNIQUE constraint stays in place since upserts
+        rely on it. Rebuilding covers the whole table, so this only pays off
+        when the ingest is large next to what is already stored (see
+        sync_stored_videos).
+        """
+        with self._write_lock, self._conn:
+            for name in DAILY_METRICS_INDEXES:
+                self._conn.execute(f'DROP INDEX IF EXISTS {name}')
+        try:
+            yield self
+        finally:
+            with self._write_lock, self._conn:
+                self._create_daily_metrics_indexes(self._conn.cursor())
+    
+    def _get_client(self, factory_name: str, label: str):
+        """Get a client from the named youtube_stats factory, or None on failure
+        
+        The factories are wrapped in youtube_stats.cache_per_thread, so each
+        sync worker thread builds its own client once and reuses it.
+        """
         try:
             # Import the function from the main script to reuse the working implementation
             import youtube_stats
-            return youtube_stats.get_youtube_analytics_client()
+            return getattr(youtube_stats, factory_name)()
         except Exception as e:
-            print(f"Error getting YouTube Analytics client: {e}")
+            print(f"Error getting {label} client: {e}")
             return None
     
+    def get_youtube_analytics_client(self):
+        """Get YouTube Analytics client - import from main module"""
+        return self._get_client('get_youtube_analytics_client', 'YouTube Analytics')
+    
     def get_youtube_data_client(self):
         """Get YouTube Data client - import from main module"""
-        try:
-            # Import the function from the main script to reuse the working implementation  
-            import youtube_stats
-            return youtube_stats.get_youtube_data_client()
-        except Exception as e:
-            print(f"Error getting YouTube Data client: {e}")
-            return None
+        return self._get_client('get_youtube_data_client', 'YouTube Data')
     
     def store_video_info(self, video: VideoInfo):
         """Store or update video information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO videos 
+                (video_id, title, published_date, channel_id, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    title = excluded.title,
+                    published_date = excluded.published_date,
+                    channel_id = excluded.channel_id,
+                    updated_at = excluded.updated_at
+            ''', (video.video_id, video.title, video.published_date, video.channel_id))
+    
+    def get_video_metadata(self, video_ids: List[str],
+                           max_age_days: int = VIDEO_METADATA_TTL_DAYS) -> Dict[str, Dict[str, str]]:
+        """Get cached titles and publish timestamps fetched within max_age_days
+        
+        Videos missing from the result were never cached or have expired.
+        """
+        cursor = self._conn.cursor()
         
+        metadata = {}
+        for i in range(0, len(video_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = video_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT video_id, title, published_at FROM video_metadata
+                WHERE video_id IN ({placeholders})
+                AND fetched_at >= datetime('now', ?)
+            ''', (*chunk, f'-{max_age_days} days'))
+            
+            for video_id, title, published_at in cursor.fetchall():
+                metadata[video_id] = {'title': title, 'published_at': published_at}
+        
+        return metadata
+    
+    def put_video_metadata(self, items: Iterable[Tuple[str, str, str]]):
+        """Cache (video_id, title, published_at) rows in a single transaction"""
+        with self._write_lock, self._conn:
+            self._conn.executemany('''
+                INSERT INTO video_metadata (video_id, title, published_at, fetched_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    title = excluded.title,
+                    published_at = excluded.published_at,
+                    fetched_at = excluded.fetched_at
+            ''', items)
+    
+    def clear_video_metadata(self):
+        """Drop all cached titles and publish dates so they are re-fetched"""
+        with self._write_lock, self._conn:
+            self._conn.execute('DELETE FROM video_metadata')
+    
+    def get_query_cache(self, cache_key: str) -> Optional[Dict]:
+        """Get a cached Analytics API response, or None on a miss"""
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT response FROM query_cache WHERE cache_key = ?', (cache_key,))
+        row = cursor.fetchone()
+        return json_loads(row[0]) if row else None
+    
+    def put_query_cache(self, entries: Iterable[Tuple[str, Dict]]):
+        """Cache (cache_key, response) Analytics API responses in a single transaction"""
+        with self._write_lock, self._conn:
+            self._conn.executemany('''
+                INSERT OR REPLACE INTO query_cache (cache_key, response)
+                VALUES (?, ?)
+            ''', ((cache_key, json_dumps(response)) for cache_key, response in entries))
+    
+    def get_report_cache(self, cache_key: str) -> Optional[Dict]:
+        """Get a report result cached earlier today (local time), or None"""
+        cursor = self._conn.cursor()
         cursor.execute('''
-            INSERT OR REPLACE INTO videos 
-            (video_id, title, published_date, channel_id, updated_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (video.video_id, video.title, video.published_date, video.channel_id))
+            SELECT payload FROM report_cache
+            WHERE cache_key = ?
+            AND date(fetched_at, 'localtime') = date('now', 'localtime')
+        ''', (cache_key,))
+        row = cursor.fetchone()
+        return json_loads(row[0]) if row else None
+    
+    def put_report_cache(self, cache_key: str, payload: Dict):
+        """Cache a report result for the rest of the day"""
+        with self._write_lock, self._conn:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO report_cache (cache_key, payload, fetched_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (cache_key, json_dumps(payload)))
+    
+    def store_daily_metrics(self, metrics: Iterable[DailyMetric]) -> int:
+        """Store daily metrics (views by traffic source by day)
         
-        conn.commit()
-        conn.close()
+        Accepts any iterable, including a lazy generator, and drains it in
+        chunks so only one chunk of rows is held in memory. Returns the
+        number of metrics written; metrics for videos not in the database
+        are skipped with a warning.
+        """
+        rows = (m.as_row() for m in metrics)
+        days_sql = days_since_published_sql('m.column2', 'v.published_date')
+        stored = 0
+        unknown_ids = set()
+        
+        while True:
+            # Pull the chunk before taking the lock so a lazy source (e.g. an
+            # API fetch) never runs inside a transaction
+            chunk = list(islice(rows, METRICS_INSERT_CHUNK_SIZE))
+            if not chunk:
+                break
+            
+            # One multi-row statement per chunk. days_since_published is computed
+            # by SQLite from the stored publish date; metrics for videos never
+            # stored are skipped.
+            values = ','.join(['(?, ?, ?, ?)'] * len(chunk))
+            with self._write_lock, self._conn:
+                cursor = self._conn.execute(f'''
+                    INSERT INTO daily_metrics
+                    (video_id, date, days_since_published, traffic_source, views)
+                    SELECT m.column1, m.column2, {days_sql}, m.column3, m.column4
+                    FROM (VALUES {values}) AS m
+                    JOIN videos v ON v.video_id = m.column1
+                    WHERE true  -- required so SQLite parses the upsert clause
+                    ON CONFLICT(video_id, date, traffic_source) DO UPDATE SET
+                        views = excluded.views,
+                        days_since_published = excluded.days_since_published
+                ''', list(chain.from_iterable(chunk)))
+            stored += cursor.rowcount
+            
+            # Fewer rows written than given means some videos were never stored
+            if cursor.rowcount < len(chunk):
+                unknown_ids.update(self._find_unknown_videos({row[0] for row in chunk}))
+        
+        if unknown_ids:
+            print(f"Skipped metrics for videos not in database: {', '.join(sorted(unknown_ids))}. "
+                  "Run sync first.")
+        return stored
     
-    def store_daily_metrics(self, metrics: List[DailyMetric]):
-        """Store daily metrics (views by traffic source by day)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _find_unknown_videos(self, video_ids: Iterable[str]) -> List[str]:
+        """Get the given video IDs that have no row in videos"""
+        video_ids = list(video_ids)
+        cursor = self._conn.cursor()
         
-        for metric in metrics:
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_metrics 
-                (video_id, date, days_since_published, traffic_source, views)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (metric.video_id, metric.date, metric.days_since_published, 
-                  metric.traffic_source, metric.views))
+        known = set()
+        for i in range(0, len(video_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = video_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT video_id FROM videos WHERE video_id IN ({placeholders})', chunk)
+            known.update(row[0] for row in cursor.fetchall())
         
-        conn.commit()
-        conn.close()
+        return [video_id for video_id in video_ids if video_id not in known]
     
-    def fetch_video_data_from_youtube(self, video_id: str) -> Optional[VideoInfo]:
-        """Fetch video metadata from YouTube Data API"""
+    def fetch_videos_batch(self, video_ids: List[str]) -> Dict[str, VideoInfo]:
+        """Fetch video metadata from YouTube Data API, 50 IDs per request"""
         data_client = self.get_youtube_data_client()
         if not data_client:
-            return None
+            return {}
         
-        try:
-            response = data_client.videos().list(
-                part='snippet',
-                id=video_id
-            ).execute()
-            
-            if not response.get('items'):
-                return None
-            
-            item = response['items'][0]
-            snippet = item['snippet']
-            
-            # Parse published date
-            published_str = snippet['publishedAt']
-            published_date = datetime.fromisoformat(published_str.replace('Z', '+00:00')).date()
+        videos = {}
+        for i in range(0, len(video_ids), DATA_API_BATCH_SIZE):
+            batch = video_ids[i:i + DATA_API_BATCH_SIZE]
+            try:
+                response = data_client.videos().list(
+                    part='snippet',
+                    id=','.join(batch)
+                ).execute(num_retries=API_NUM_RETRIES)
+            except Exception as e:
+                print(f"Error fetching video data for {', '.join(batch)}: {e}")
+                continue
             
-            return VideoInfo(
-                video_id=video_id,
-                title=snippet['title'],
-                published_date=published_date,
-                channel_id=snippet['channelId']
-            )
-        except Exception as e:
-            print(f"Error fetching video data for {video_id}: {e}")
-            return None
+            for item in response.get('items', []):
+                snippet = item['snippet']
+                
+                # Parse published date from the leading YYYY-MM-DD of the UTC timestamp
+                published_date = date.fromisoformat(snippet['publishedAt'][:10])
+                
+                videos[item['id']] = VideoInfo(
+                    video_id=item['id'],
+                    title=snippet['title'],
+                    published_date=published_date,
+                    channel_id=snippet['channelId']
+                )
+        
+        return videos
+    
+    def fetch_video_data_from_youtube(self, video_id: str) -> Optional[VideoInfo]:
+        """Fetch video metadata from YouTube Data API"""
+        return self.fetch_videos_batch([video_id]).get(video_id)
     
-    def fetch_daily_analytics_from_youtube(self, video_id: str, start_date: date, end_date: date) -> List[DailyMetric]:
-        """Fetch daily analytics data from YouTube Analytics API"""
+    def fetch_daily_analytics_from_youtube(self, video_id: str, start_date: date, end_date: date) -> Iterator[DailyMetric]:
+        """Fetch daily analytics data from YouTube Analytics API
+        
+        Yields metrics lazily; nothing is requested until iteration starts.
+        """
         analytics_client = self.get_youtube_analytics_client()
         if not analytics_client:
-            return []
-        
-        # Get video info to calculate days since published
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT published_date FROM videos WHERE video_id = ?', (video_id,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
-            print(f"Video {video_id} not found in database. Run sync first.")
-            return []
-        
-        published_date = datetime.strptime(result[0], '%Y-%m-%d').date()
+            return
         
         try:
             response = analytics_client.reports().query(
@@ -185,33 +458,90 @@ class YouTubeAnalyticsDB:
                 dimensions='day,insightTrafficSourceType',
                 filters=f'video=={video_id}',
                 sort='day,-views'
-            ).execute()
+            ).execute(num_retries=API_NUM_RETRIES)
+        except Exception as e:
+            print(f"Error fetching analytics for {video_id}: {e}")
+            return
+        
+        for row in response.get('rows', []):
+            day_str, traffic_source, views = row
+            yield DailyMetric(
+                video_id=video_id,
+                date=date.fromisoformat(day_str),
+                traffic_source=traffic_source,
+                views=int(views)
+            )
+    
+    def fetch_channel_daily_analytics(self, video_ids: List[str], start_date: date,
+                                      end_date: date) -> Iterator[DailyMetric]:
+        """Fetch daily views by traffic source for many videos at once
+        
+        Issues one Analytics query per ANALYTICS_FILTER_CHUNK_SIZE videos
+        instead of one per video. Yields metrics lazily; nothing is requested
+        until iteration starts. Unlike fetch_daily_analytics_from_youtube,
+        API errors are raised so a failed refresh is not mistaken for one
+        with no data.
+        """
+        analytics_client = self.get_youtube_analytics_client()
+        if not analytics_client:
+            raise RuntimeError("YouTube Analytics client is not available")
+        
+        for i in range(0, len(video_ids), ANALYTICS_FILTER_CHUNK_SIZE):
+            chunk = video_ids[i:i + ANALYTICS_FILTER_CHUNK_SIZE]
+            response = analytics_client.reports().query(
+                ids='channel==MINE',
+                startDate=start_date.strftime('%Y-%m-%d'),
+                endDate=end_date.strftime('%Y-%m-%d'),
+                metrics='views',
+                dimensions='day,video,insightTrafficSourceType',
+                filters=f"video=={','.join(chunk)}",
+                sort='day'
+            ).execute(num_retries=API_NUM_RETRIES)
             
-            metrics = []
-            for row in response.get('rows', []):
-                day_str, traffic_source, views = row
-                day = datetime.strptime(day_str, '%Y-%m-%d').date()
-                days_since_published = (day - published_date).days
-                
-                metrics.append(DailyMetric(
+            for day_str, video_id, traffic_source, views in response.get('rows', []):
+                yield DailyMetric(
                     video_id=video_id,
-                    date=day,
-                    days_since_published=days_since_published,
+                    date=date.fromisoformat(day_str),
                     traffic_source=traffic_source,
                     views=int(views)
-                ))
-            
-            return metrics
-        except Exception as e:
-            print(f"Error fetching analytics for {video_id}: {e}")
-            return []
+                )
     
-    def sync_video(self, video_id: str, days_back: int = 30):
-        """Sync a single video's data and analytics"""
+    def sync_stored_videos(self, days_back: int = 30) -> int:
+        """Refresh daily metrics for every video already in the database
+        
+        Fetches the stored videos' metrics in filtered batches (see
+        fetch_channel_daily_analytics). Returns the number of metrics
+        written; API errors propagate to the caller.
+        """
+        video_ids = self.get_stored_video_ids()
+        if not video_ids:
+            print("No videos in database. Run --sync recent first.")
+            return 0
+        
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days_back)
+        
+        # At least one row per video per day; only drop the indexes when that
+        # outweighs the table they would be rebuilt over (e.g. a first load)
+        expected_rows = len(video_ids) * (days_back + 1)
+        bulk = expected_rows >= self.count_daily_metrics()
+        with self.bulk_mode() if bulk else nullcontext():
+            stored = self.store_daily_metrics(
+                self.fetch_channel_daily_analytics(video_ids, start_date, end_date))
+        print(f"Stored {stored} daily metrics")
+        return stored
+    
+    def sync_video(self, video_id: str, days_back: int = 30, video_info: Optional[VideoInfo] = None):
+        """Sync a single video's data and analytics
+        
+        Pass video_info when the metadata was already fetched (e.g. by
+        fetch_videos_batch) to skip the Data API call.
+        """
         print(f"Syncing video {video_id}...")
         
         # Fetch and store video info
-        video_info = self.fetch_video_data_from_youtube(video_id)
+        if video_info is None:
+            video_info = self.fetch_video_data_from_youtube(video_id)
         if not video_info:
             print(f"Could not fetch info for video {video_id}")
             return False
@@ -225,16 +555,61 @@ class YouTubeAnalyticsDB:
         start_date = max(video_info.published_date, end_date - timedelta(days=days_back))
         
         daily_metrics = self.fetch_daily_analytics_from_youtube(video_id, start_date, end_date)
-        if daily_metrics:
-            self.store_daily_metrics(daily_metrics)
-            print(f"  Stored {len(daily_metrics)} daily metrics")
+        stored = self.store_daily_metrics(daily_metrics)
+        if stored:
+            print(f"  Stored {stored} daily metrics")
         
         return True
     
+    async def sync_videos_async(self, video_ids: List[str], days_back: int = 30,
+                                on_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+        """Sync several videos concurrently, at most SYNC_CONCURRENCY at a time
+        
+        on_done(video_id, success) is called as each video finishes.
+        """
+        # Prefetch all metadata up front: one Data API request per 50 videos
+        video_infos = await asyncio.to_thread(self.fetch_videos_batch, video_ids)
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+        
+        async def sync_one(video_id: str) -> bool:
+            video_info = video_infos.get(video_id)
+            if video_info is None:
+                print(f"Could not fetch info for video {video_id}")
+                success = False
+            else:
+                async with semaphore:
+                    # The Google API client is blocking, so run each sync on a worker thread
+                    success = await asyncio.to_thread(self.sync_video, video_id, days_back, video_info)
+            if on_done:
+                on_done(video_id, success)
+            return success
+        
+        results = await asyncio.gather(*(sync_one(video_id) for video_id in video_ids))
+        return dict(zip(video_ids, results))
+    
+    def sync_videos(self, video_ids: List[str], days_back: int = 30,
+                    on_done: Optional[Callable[[str, bool], None]] = None) -> Dict[str, bool]:
+        """Sync several videos concurrently; returns success per video ID"""
+        if not video_ids:
+            return {}
+        
+        return asyncio.run(self.sync_videos_async(video_ids, days_back, on_done))
+    
+    def count_daily_metrics(self) -> int:
+        """Get the number of rows in daily_metrics"""
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM daily_metrics')
+        return cursor.fetchone()[0]
+    
+    def get_stored_video_ids(self) -> List[str]:
+        """Get the IDs of every video in the database"""
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT video_id FROM videos')
+        return [row[0] for row in cursor.fetchall()]
+    
     def get_recent_videos(self, limit: int = 10) -> List[str]:
         """Get most recently published video IDs"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute('''
             SELECT video_id FROM videos 
@@ -242,37 +617,34 @@ class YouTubeAnalyticsDB:
             LIMIT ?
         ''', (limit,))
         
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return [row[0] for row in cursor.fetchall()]
     
     def analyze_first_week_performance(self, video_ids: List[str], traffic_source: str = 'BROWSE') -> Dict:
         """Compare first 7 days performance for given videos"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         results = {}
-        for video_id in video_ids:
-            cursor.execute('''
-                SELECT v.title, v.published_date, SUM(dm.views) as total_views
+        # One grouped query per chunk of IDs, kept under SQLite's 999 parameter limit
+        for i in range(0, len(video_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = video_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT v.video_id, v.title, v.published_date, COALESCE(SUM(dm.views), 0) as total_views
                 FROM videos v
                 LEFT JOIN daily_metrics dm ON v.video_id = dm.video_id
-                WHERE v.video_id = ? 
                 AND dm.days_since_published BETWEEN 0 AND 6
                 AND dm.traffic_source = ?
+                WHERE v.video_id IN ({placeholders})
                 GROUP BY v.video_id
-            ''', (video_id, traffic_source))
+            ''', (traffic_source, *chunk))
             
-            result = cursor.fetchone()
-            if result:
-                title, published_date, total_views = result
+            for video_id, title, published_date, total_views in cursor.fetchall():
                 results[video_id] = {
                     'title': title,
                     'published_date': published_date,
-                    'first_week_views': total_views or 0
+                    'first_week_views': total_views
                 }
         
-        conn.close()
         return results
 
 if __name__ == "__main__":
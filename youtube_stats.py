@@ -1,32 +1,161 @@
 #!/usr/bin/env python
+import asyncio
 import click
 from analytix import Client
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+import functools
+import google_auth_httplib2
+import hashlib
+import heapq
+import httplib2
+import io
 import json
+from operator import itemgetter
 import os
+import threading
+import pandas as pd
 from googleapiclient.discovery import build
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 from rich.text import Text
 from rich import box
-from youtube_analytics_db import YouTubeAnalyticsDB
+from youtube_analytics_db import API_NUM_RETRIES, YouTubeAnalyticsDB
 
 # Initialize Rich console
 console = Console()
 
+# Max sub-requests per Google API batch / IDs per Data API videos.list call
+API_BATCH_SIZE = 50
+
+# Socket timeout for Google API requests, in seconds
+API_TIMEOUT = 30
+
+# Access tokens are refreshed this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+
+# Analytics data can still be backfilled for this many days after the fact;
+# queries ending earlier than that are final and safe to cache
+ANALYTICS_SETTLE_DAYS = 2
+
+# Data API videos.list batches fetched in parallel by get_video_info
+VIDEO_INFO_WORKERS = 4
+
 # Configuration for branded keywords to highlight in reports
 BRANDED_KEYWORDS = [
     "pulumi",
     "pulumi tutorial",
 ]
+BRANDED_KEYWORDS_SET = frozenset(kw.lower() for kw in BRANDED_KEYWORDS)
 
-def get_youtube_data_client():
-    """Create a separate YouTube Data API client with expanded OAuth scope"""
+# Placeholder for videos whose title and date couldn't be fetched
+_UNKNOWN_INFO = {'title': "Title unavailable", 'date': "Unknown"}
+
+# Report table columns as (header, Table.add_column options)
+_RANK_COLUMN = ("Rank", {"style": "dim", "width": 4})
+_VIDEO_COLUMNS = [
+    ("Title", {"style": "white"}),
+    ("Date", {"style": "cyan", "width": 8}),
+    ("Link", {"style": "blue underline", "width": 30}),
+]
+_KEYWORD_COLUMNS = [
+    _RANK_COLUMN,
+    ("Views", {"justify": "right", "style": "purple"}),
+    ("Search Keyword", {"style": "white"}),
+]
+_LATEST_VIDEO_KEYWORD_COLUMNS = _KEYWORD_COLUMNS + [("Type", {"style": "cyan", "width": 8})]
+_SEARCH_TRAFFIC_COLUMNS = [_RANK_COLUMN, ("Search Views", {"justify": "right", "style": "blue"}), *_VIDEO_COLUMNS]
+_ORGANIC_COLUMNS = [_RANK_COLUMN, ("Organic Views", {"justify": "right", "style": "green"}), *_VIDEO_COLUMNS]
+
+# Month abbreviations indexed by month number, for "Jun 24" style dates
+_MONTH_ABBR = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+_client_cache = threading.local()
+
+def cache_per_thread(factory):
+    """Memoize a zero-argument client factory, once per thread
+    
+    googleapiclient clients are not thread-safe, so threads never share
+    one. Failed builds (None or an exception) are not cached, so the next
+    call retries. Also used by YouTubeAnalyticsDB for its sync workers.
+    """
+    @functools.wraps(factory)
+    def wrapper():
+        client = getattr(_client_cache, factory.__name__, None)
+        if client is None:
+            client = factory()
+            if client is not None:
+                setattr(_client_cache, factory.__name__, client)
+        return client
+    return wrapper
+
+_credentials_cache = {}
+_credentials_lock = threading.Lock()
+
+def cache_credentials(loader):
+    """Memoize a zero-argument credentials loader for the whole process
+    
+    Unlike clients, Credentials can be shared between threads, so every
+    per-thread client reuses one object and a token is refreshed (or
+    authorized) at most once per run.
+    """
+    @functools.wraps(loader)
+    def wrapper():
+        with _credentials_lock:
+            creds = _credentials_cache.get(loader.__name__)
+            if creds is None:
+                creds = loader()
+                _credentials_cache[loader.__name__] = creds
+            return creds
+    return wrapper
+
+def token_needs_refresh(creds):
+    """Whether creds are expired or within TOKEN_REFRESH_MARGIN of expiring
+    
+    A token with no known expiry (e.g. a token file saved without one) is
+    refreshed if it can be, so the caller learns and can save the expiry.
+    """
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return creds.refresh_token is not None
+    # google-auth keeps expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry - now < TOKEN_REFRESH_MARGIN
+
+def analytix_token_expiry(token_data, path):
+    """Expiry of an analytix token file, as naive UTC, or None if unknown
+    
+    analytix stores the lifetime (expires_in) rather than an expiry, and
+    rewrites the file whenever it gets a new token, so the token expires
+    expires_in seconds after the file was last modified.
+    """
+    expires_in = token_data.get("expires_in")
+    if expires_in is None:
+        return None
+    written = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).replace(tzinfo=None)
+    return written + timedelta(seconds=int(expires_in))
+
+def save_youtube_data_tokens(creds, client_id, client_secret):
+    """Save YouTube Data API tokens for the next run"""
+    token_data = {
+        "access_token": creds.token,
+        "refresh_token": creds.refresh_token,
+        "client_id": client_id,
+        "client_secret": client_secret,
+    }
+    if creds.expiry:
+        token_data["expiry"] = creds.expiry.isoformat()
+    with open("youtube_data_tokens.json", "w") as f:
+        json.dump(token_data, f)
+
+@cache_credentials
+def get_youtube_data_credentials():
+    """Load YouTube Data API credentials, refreshing or authorizing as needed"""
     from google_auth_oauthlib.flow import InstalledAppFlow
-    import json
-    import os
     
     # Check if we have YouTube Data API tokens
     if os.path.exists("youtube_data_tokens.json"):
@@ -43,18 +172,17 @@ def get_youtube_data_client():
             token_uri="https://oauth2.googleapis.com/token",
             scopes=["https://www.googleapis.com/auth/youtube.readonly"]
         )
+        if token_data.get("expiry"):
+            creds.expiry = datetime.fromisoformat(token_data["expiry"])
         
-        # Check if token is valid
-        if creds.valid:
-            return build('youtube', 'v3', credentials=creds)
-        elif creds.expired and creds.refresh_token:
+        # Refresh shortly before expiry rather than on a failed request
+        if not token_needs_refresh(creds):
+            return creds
+        elif creds.refresh_token:
             from google.auth.transport.requests import Request
             creds.refresh(Request())
-            # Save refreshed token
-            token_data["access_token"] = creds.token
-            with open("youtube_data_tokens.json", "w") as f:
-                json.dump(token_data, f)
-            return build('youtube', 'v3', credentials=creds)
+            save_youtube_data_tokens(creds, token_data["client_id"], token_data["client_secret"])
+            return creds
     
     # Need to authorize
     scopes = ["https://www.googleapis.com/auth/youtube.readonly"]
@@ -64,171 +192,392 @@ def get_youtube_data_client():
     # Save tokens for next time
     with open("client_secrets.json", "r") as f:
         secrets = json.load(f)
+    save_youtube_data_tokens(creds, secrets["installed"]["client_id"],
+                             secrets["installed"]["client_secret"])
     
-    token_data = {
-        "access_token": creds.token,
-        "refresh_token": creds.refresh_token,
-        "client_id": secrets["installed"]["client_id"],
-        "client_secret": secrets["installed"]["client_secret"]
-    }
-    with open("youtube_data_tokens.json", "w") as f:
-        json.dump(token_data, f)
+    return creds
+
+def authorized_http(creds):
+    """Create an authorized keep-alive HTTP transport for one thread's client
+    
+    The connection is reused by every request of the (per-thread) client,
+    and a stalled request fails after API_TIMEOUT rather than hanging.
+    """
+    return google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=API_TIMEOUT))
+
+@cache_per_thread
+def get_youtube_data_client():
+    """Create a separate YouTube Data API client with expanded OAuth scope"""
+    return build('youtube', 'v3', http=authorized_http(get_youtube_data_credentials()),
+                 static_discovery=True)
+
+def fetch_video_snippets(video_ids):
+    """Fetch (video_id, title, publishedAt) for each video from YouTube Data API"""
+    if not video_ids:
+        return []
+    
+    # Authorize on this thread first so workers only load saved tokens
+    get_youtube_data_client()
+    
+    def fetch_batch(batch):
+        # Each worker thread gets its own client (httplib2 is not thread-safe)
+        return get_youtube_data_client().videos().list(
+            part='snippet',
+            id=','.join(batch)
+        ).execute(num_retries=API_NUM_RETRIES)['items']
+    
+    # Get video details in batches of 50 (API limit), in parallel
+    batches = [video_ids[i:i+API_BATCH_SIZE] for i in range(0, len(video_ids), API_BATCH_SIZE)]
+    if len(batches) <= 1:
+        responses = list(map(fetch_batch, batches))
+    else:
+        with ThreadPoolExecutor(max_workers=VIDEO_INFO_WORKERS) as executor:
+            responses = list(executor.map(fetch_batch, batches))
+    
+    return [
+        (item['id'], item['snippet']['title'], item['snippet']['publishedAt'])
+        for batch_items in responses for item in batch_items
+    ]
+
+def make_cache_key(data):
+    """Hash JSON-serializable data into a key for the persistent caches"""
+    return hashlib.blake2b(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+def account_cache_id():
+    """Opaque identity of the authorized account, or None if not authorized
     
-    return build('youtube', 'v3', credentials=creds)
+    Persistent cache keys include it so several channels can share one
+    database file without seeing each other's cached data.
+    """
+    try:
+        creds = get_youtube_analytics_credentials()
+    except Exception:
+        return None
+    return make_cache_key([creds.client_id, creds.refresh_token])
+
+# cache_key -> response for every query already made by this process
+_query_responses = {}
+# cache_key -> response for settled queries not yet written to the database
+_pending_query_cache = {}
+
+def cached_analytics_query(yt_analytics, **params):
+    """Run a YouTube Analytics reports().query, reusing cached responses
+    
+    Every response is reused for the rest of the process. Only queries
+    whose endDate is at least ANALYTICS_SETTLE_DAYS old are also cached in
+    the database, since more recent numbers can still change; they are
+    held in memory until flush_query_cache() writes them in one batch.
+    """
+    account_id = account_cache_id()
+    cache_key = make_cache_key([account_id, params])
+    cached = _query_responses.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Without a known account, nothing is shared through the database
+    settled = (account_id is not None and
+               params['endDate'] <= (date.today() - timedelta(days=ANALYTICS_SETTLE_DAYS)).isoformat())
+    if settled:
+        cached = get_db().get_query_cache(cache_key)
+        if cached is not None:
+            _query_responses[cache_key] = cached
+            return cached
+    
+    resp = yt_analytics.reports().query(**params).execute(num_retries=API_NUM_RETRIES)
+    _query_responses[cache_key] = resp
+    if settled:
+        _pending_query_cache[cache_key] = resp
+    return resp
+
+def flush_query_cache():
+    """Write responses cached by cached_analytics_query to the database"""
+    if not _pending_query_cache:
+        return
+    get_db().put_query_cache(_pending_query_cache.items())
+    _pending_query_cache.clear()
 
-def get_video_info(video_ids):
-    """Get video titles and publish dates from YouTube Data API"""
+# video_id -> formatted info for videos already looked up by this process
+_video_info_memo = {}
+
+def get_video_info(video_ids, console=console):
+    """Get video titles and publish dates, from the local cache or YouTube Data API
+    
+    Results are memoized per video for the rest of the process, so reports
+    sharing top videos look each one up once.
+    """
+    missing = [vid for vid in video_ids if vid not in _video_info_memo]
+    if missing:
+        _video_info_memo.update(lookup_video_info(missing, console=console))
+    return {vid: _video_info_memo.get(vid, _UNKNOWN_INFO) for vid in video_ids}
+
+def lookup_video_info(video_ids, console=console):
+    """Format titles and publish dates for videos not yet memoized"""
     try:
-        youtube = get_youtube_data_client()
-        
-        # Get video details in batches of 50 (API limit)
-        video_info = {}
-        for i in range(0, len(video_ids), 50):
-            batch = video_ids[i:i+50]
-            response = youtube.videos().list(
-                part='snippet',
-                id=','.join(batch)
-            ).execute()
-            
-            for item in response['items']:
-                title = item['snippet']['title']
-                # Truncate title to 25 characters
-                if len(title) > 25:
-                    title = title[:22] + "..."
-                
-                # Format publish date (e.g., "Jun 24" or "6/24")
-                from datetime import datetime
-                pub_date = datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00'))
-                date_str = pub_date.strftime("%b %d")  # e.g., "Jun 24"
-                
-                video_info[item['id']] = {
-                    'title': title,
-                    'date': date_str
-                }
+        # Titles and publish dates rarely change, so only fetch videos not cached
+        db = get_db()
+        cached = db.get_video_metadata(video_ids)
+        fetched = fetch_video_snippets([vid for vid in video_ids if vid not in cached])
+        if fetched:
+            db.put_video_metadata(fetched)
+        
+        records = [(vid, meta['title'], meta['published_at']) for vid, meta in cached.items()]
+        records.extend(fetched)
+        if not records:
+            return {}
+        
+        df = pd.DataFrame(records, columns=['id', 'title', 'published_at'])
+        
+        # Truncate titles to 25 characters
+        titles = df['title']
+        titles = titles.where(titles.str.len() <= 25, titles.str.slice(0, 22) + "...")
         
-        return video_info
+        # Format publish dates (e.g., "Jun 24")
+        dates = pd.to_datetime(df['published_at'], utc=True).dt.strftime("%b %d")
+        
+        return {
+            video_id: {'title': title, 'date': date_str}
+            for video_id, title, date_str in zip(df['id'], titles, dates)
+        }
     except Exception as e:
-        print(f"Warning: Could not fetch video info: {e}")
-        return {vid: {'title': "Title unavailable", 'date': "Unknown"} for vid in video_ids}
+        # Not memoized, so a later lookup can retry
+        console.print(f"[yellow]Warning: Could not fetch video info: {e}[/yellow]")
+        return {}
 
+@functools.lru_cache(maxsize=1)
 def get_client():
-    """Initialize and return authenticated client"""
+    """Initialize and return authenticated client (built once per process)"""
     return Client("client_secrets.json")
 
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Return the process-wide YouTubeAnalyticsDB, opened on first use
+    
+    Its connection is safe to share between report threads.
+    """
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = YouTubeAnalyticsDB()
+        return _db
+
+@cache_credentials
+def get_youtube_analytics_credentials():
+    """Load YouTube Analytics credentials from the analytix OAuth tokens"""
+    # Use the same OAuth tokens from analytix
+    from google.oauth2.credentials import Credentials
+    
+    # Read client secrets
+    with open("client_secrets.json", "r") as f:
+        secrets = json.load(f)
+    
+    # Read tokens
+    with open("tokens.json", "r") as f:
+        token_data = json.load(f)
+    
+    # Create credentials
+    creds = Credentials(
+        token=token_data["access_token"],
+        refresh_token=token_data["refresh_token"],
+        client_id=secrets["installed"]["client_id"],
+        client_secret=secrets["installed"]["client_secret"],
+        token_uri="https://oauth2.googleapis.com/token",
+        scopes=["https://www.googleapis.com/auth/yt-analytics.readonly"]
+    )
+    creds.expiry = analytix_token_expiry(token_data, "tokens.json")
+    
+    if token_needs_refresh(creds):
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+    
+    return creds
+
+@cache_per_thread
 def get_youtube_analytics_client():
     """Get YouTube Analytics API v2 client using same OAuth tokens"""
     try:
-        # Use the same OAuth tokens from analytix
-        from google.oauth2.credentials import Credentials
-        import json
-        
-        # Read client secrets
-        with open("client_secrets.json", "r") as f:
-            secrets = json.load(f)
-        
-        # Read tokens
-        with open("tokens.json", "r") as f:
-            token_data = json.load(f)
-        
-        # Create credentials
-        creds = Credentials(
-            token=token_data["access_token"],
-            refresh_token=token_data["refresh_token"],
-            client_id=secrets["installed"]["client_id"],
-            client_secret=secrets["installed"]["client_secret"],
-            token_uri="https://oauth2.googleapis.com/token",
-            scopes=["https://www.googleapis.com/auth/yt-analytics.readonly"]
-        )
-        
-        return build('youtubeAnalytics', 'v2', credentials=creds)
+        return build('youtubeAnalytics', 'v2', http=authorized_http(get_youtube_analytics_credentials()),
+                     static_discovery=True)
         
     except Exception as e:
         print(f"Error creating YouTube Analytics client: {e}")
         return None
 
-def get_organic_views_per_video(client, start_date, end_date, max_videos=30):
-    """Get precise organic views per video using YouTube Analytics API v2"""
+# (start_date, end_date) -> (client, max_videos, DataFrame) for get_top_videos
+_top_videos_cache = {}
+
+def get_top_videos(client, start_date, end_date, max_videos):
+    """Get the top videos by total views as a DataFrame (video, views)
+    
+    Results are cached per date range for the life of the process; a
+    cached fetch of at least max_videos rows is reused by slicing it.
+    """
+    cached = _top_videos_cache.get((start_date, end_date))
+    if cached is not None:
+        cached_client, cached_max, cached_df = cached
+        if cached_client is client and cached_max >= max_videos:
+            return cached_df.head(max_videos)
+    
+    total_report = client.fetch_report(
+        dimensions=("video",),
+        metrics=("views",),
+        start_date=start_date,
+        end_date=end_date,
+        sort_options=("-views",),
+        max_results=max_videos,
+    )
+    total_df = total_report.to_pandas()
+    _top_videos_cache[(start_date, end_date)] = (client, max_videos, total_df)
+    return total_df
+
+def get_traffic_source_rows(yt_analytics, video_ids, start_date, end_date, console=console):
+    """Get (video, traffic source, views) rows for the given videos
+    
+    Tries one combined query first (comma = OR in filters). If the API
+    rejects it, sends the per-video queries together via BatchHttpRequest,
+    50 per HTTP round-trip, then retries failed ones individually.
+    Returns (rows, failed_video_ids).
+    """
+    query_params = dict(
+        ids="channel==MINE",
+        startDate=start_date.strftime("%Y-%m-%d"),
+        endDate=end_date.strftime("%Y-%m-%d"),
+        metrics="views",
+        dimensions="video,insightTrafficSourceType",
+        sort="-views"
+    )
+    
     try:
-        # First get top videos by total views
-        total_report = client.fetch_report(
-            dimensions=("video",),
-            metrics=("views",),
-            start_date=start_date,
-            end_date=end_date,
-            sort_options=("-views",),
-            max_results=max_videos,
+        resp = cached_analytics_query(
+            yt_analytics, filters="video==" + ",".join(video_ids), **query_params
         )
-        total_df = total_report.to_pandas()
+        return resp.get('rows', []), []
+    except Exception as e:
+        console.print(f"[dim]Combined traffic query failed ({e}), batching per-video queries...[/dim]")
+    
+    rows = []
+    failed = []
+    
+    def collect(request_id, response, exception):
+        if exception is not None:
+            failed.append(request_id)
+        else:
+            rows.extend(response.get('rows', []))
+    
+    for i in range(0, len(video_ids), API_BATCH_SIZE):
+        batch_ids = video_ids[i:i+API_BATCH_SIZE]
+        batch = yt_analytics.new_batch_http_request(callback=collect)
+        for video_id in batch_ids:
+            batch.add(
+                yt_analytics.reports().query(filters=f"video=={video_id}", **query_params),
+                request_id=video_id
+            )
+        try:
+            batch.execute()
+        except Exception:
+            failed.extend(batch_ids)
+    
+    # Batches can't retry individual sub-requests, so retry failures one by one
+    still_failed = []
+    for video_id in failed:
+        try:
+            resp = yt_analytics.reports().query(
+                filters=f"video=={video_id}", **query_params
+            ).execute(num_retries=API_NUM_RETRIES)
+            rows.extend(resp.get('rows', []))
+        except Exception as e:
+            console.print(f"[red]  Error getting traffic for {video_id}: {e}[/red]")
+            still_failed.append(video_id)
+    
+    return rows, still_failed
+
+# (start_date, end_date, max_videos) -> (client, result) for get_traffic_breakdown
+_traffic_breakdown_cache = {}
+# Held while fetching so concurrent reports wait for one fetch instead of repeating it
+_traffic_breakdown_lock = threading.Lock()
+
+def get_traffic_breakdown(client, start_date, end_date, max_videos=30, console=console):
+    """Get views per traffic source for the top videos
+    
+    Returns (breakdown, fallback_views): a DataFrame indexed by video with
+    one column per traffic source, and {video_id: total_views} for videos
+    whose traffic sources couldn't be fetched. Fetched once per date range
+    and shared by the organic and search reports; concurrent callers wait
+    for the single fetch, whose warnings go to the first caller's console.
+    Returns None if the YouTube Analytics API can't be used.
+    """
+    with _traffic_breakdown_lock:
+        cached = _traffic_breakdown_cache.get((start_date, end_date, max_videos))
+        if cached is not None and cached[0] is client:
+            return cached[1]
+        
+        # First get top videos by total views
+        total_df = get_top_videos(client, start_date, end_date, max_videos)
         if total_df.empty:
-            return {}
+            return pd.DataFrame(), {}
         
         # Get YouTube Analytics API client
         yt_analytics = get_youtube_analytics_client()
         if not yt_analytics:
-            print("Falling back to ratio-based approximation...")
-            return get_organic_views_with_ratio_fallback(client, start_date, end_date, max_videos)
+            return None
         
-        organic_views = {}
+        video_ids = total_df['video'].tolist()
+        try:
+            rows, failed = get_traffic_source_rows(yt_analytics, video_ids, start_date, end_date,
+                                                   console=console)
+        except Exception as e:
+            console.print(f"[red]  Error getting per-video traffic: {e}[/red]")
+            return None
         
-    
-        for _, row in total_df.iterrows():
-            video_id = row['video']
-            total_views = int(row['views'])
-            
-            try:
-                # Get per-video traffic source breakdown
-                resp = yt_analytics.reports().query(
-                    ids=f"channel==MINE",
-                    startDate=start_date.strftime("%Y-%m-%d"),
-                    endDate=end_date.strftime("%Y-%m-%d"),
-                    metrics="views",
-                    dimensions="video,insightTrafficSourceType",
-                    filters=f"video=={video_id}",
-                    sort="-views"
-                ).execute()
-                
-                # Calculate organic views (exclude ADVERTISING)
-                organic_count = 0
-                ad_count = 0
-                
-                if 'rows' in resp:
-                    for traffic_row in resp['rows']:
-                        _, source_type, views = traffic_row
-                        views = int(views)
-                        
-                        if source_type == 'ADVERTISING':
-                            ad_count += views
-                        else:
-                            organic_count += views
-                
-                organic_views[video_id] = organic_count
-                ad_percentage = (ad_count / total_views * 100) if total_views > 0 else 0
+        # Pivot to one row per video, one column per traffic source. Videos
+        # whose query failed are left out rather than counted as zero views.
+        failed_ids = set(failed)
+        fetched_ids = [vid for vid in video_ids if vid not in failed_ids]
+        breakdown = pd.DataFrame(index=fetched_ids)
+        if rows:
+            df = pd.DataFrame(rows, columns=['video', 'source', 'views']).astype({'views': 'int64'})
+            breakdown = df.pivot_table(index='video', columns='source', values='views',
+                                       aggfunc='sum', fill_value=0)
+        breakdown = breakdown.reindex(fetched_ids, fill_value=0)
+        
+        total_views = total_df.set_index('video')['views'].astype('int64')
+        fallback_views = {vid: int(total_views[vid]) for vid in failed}
+        
+        # Only complete breakdowns are reused; a partial one is refetched
+        if not failed:
+            _traffic_breakdown_cache[(start_date, end_date, max_videos)] = (client, (breakdown, {}))
+        return breakdown, fallback_views
 
-                
-            except Exception as e:
-                console.print(f"[red]  Error getting traffic for {video_id}: {e}[/red]")
-                # Fallback to total views if per-video fails
-                organic_views[video_id] = total_views
+def get_organic_views_per_video(client, start_date, end_date, max_videos=30, console=console):
+    """Get precise organic views per video using YouTube Analytics API v2
+    
+    Returns (organic_views, precise). precise is False when any video's
+    count came from a fallback (total views or the channel-wide ratio).
+    """
+    try:
+        result = get_traffic_breakdown(client, start_date, end_date, max_videos, console=console)
+        if result is None:
+            console.print("[dim]Falling back to ratio-based approximation...[/dim]")
+            return get_organic_views_with_ratio_fallback(client, start_date, end_date, max_videos,
+                                                         console=console), False
+        breakdown, fallback_views = result
         
-        return organic_views
+        # Calculate organic views (exclude ADVERTISING)
+        organic_views = (breakdown.sum(axis=1) - breakdown.get('ADVERTISING', 0)).to_dict()
+        # Fallback to total views for videos whose traffic couldn't be fetched
+        organic_views.update(fallback_views)
+        return organic_views, not fallback_views
         
     except Exception as e:
-        print(f"Warning: Could not get per-video organic views: {e}")
-        return {}
+        console.print(f"[yellow]Warning: Could not get per-video organic views: {e}[/yellow]")
+        return {}, False
 
-def get_organic_views_with_ratio_fallback(client, start_date, end_date, max_videos=30):
+def get_organic_views_with_ratio_fallback(client, start_date, end_date, max_videos=30, console=console):
     """Fallback method using channel-wide ratio"""
     try:
         # Get total views by video
-        total_report = client.fetch_report(
-            dimensions=("video",),
-            metrics=("views",),
-            start_date=start_date,
-            end_date=end_date,
-            sort_options=("-views",),
-            max_results=max_videos,
-        )
-        total_df = total_report.to_pandas()
+        total_df = get_top_videos(client, start_date, end_date, max_videos)
         if total_df.empty:
             return {}
         
@@ -246,89 +595,69 @@ def get_organic_views_with_ratio_fallback(client, start_date, end_date, max_vide
         ad_views = traffic_df[traffic_df['insightTrafficSourceType'] == 'ADVERTISING']['views'].sum()
         ad_ratio = ad_views / total_channel_views if total_channel_views > 0 else 0
         
-        print(f"Using channel-wide ratio: {ad_ratio:.1%} advertising")
-        print("Note: This is an approximation. Individual videos may vary significantly.")
+        console.print(f"[dim]Using channel-wide ratio: {ad_ratio:.1%} advertising[/dim]")
+        console.print("[dim]Note: This is an approximation. Individual videos may vary significantly.[/dim]")
         
         # Apply ratio to each video (this is an approximation)
         organic_views = {}
-        for _, row in total_df.iterrows():
-            video_id = row['video']
-            total_views = int(row['views'])
+        for video_id, total_views in zip(total_df['video'].tolist(),
+                                         total_df['views'].astype('int64').tolist()):
             estimated_ad_views = int(total_views * ad_ratio)
             organic_views[video_id] = max(0, total_views - estimated_ad_views)
         
         return organic_views
         
     except Exception as e:
-        print(f"Warning: Could not calculate organic views: {e}")
+        console.print(f"[yellow]Warning: Could not calculate organic views: {e}[/yellow]")
         return {}
 
-def get_search_traffic_views(client, start_date, end_date, max_videos=30):
+def get_search_traffic_views(client, start_date, end_date, max_videos=30, console=console):
     """Get YouTube search traffic views per video"""
     try:
-        # Get top videos by total views first
-        total_report = client.fetch_report(
-            dimensions=("video",),
-            metrics=("views",),
-            start_date=start_date,
-            end_date=end_date,
-            sort_options=("-views",),
-            max_results=max_videos,
-        )
-        total_df = total_report.to_pandas()
-        if total_df.empty:
-            return {}
-        
-        # Get YouTube Analytics API client
-        yt_analytics = get_youtube_analytics_client()
-        if not yt_analytics:
+        result = get_traffic_breakdown(client, start_date, end_date, max_videos, console=console)
+        if result is None:
             console.print("[red]Cannot get search traffic data without YouTube Analytics API[/red]")
             return {}
+        # Videos whose traffic couldn't be fetched have no search count to show
+        breakdown, _ = result
         
-        search_views = {}
-        
-    
-        for _, row in total_df.iterrows():
-            video_id = row['video']
-            
-            try:
-                # Get traffic source breakdown for this video
-                resp = yt_analytics.reports().query(
-                    ids=f"channel==MINE",
-                    startDate=start_date.strftime("%Y-%m-%d"),
-                    endDate=end_date.strftime("%Y-%m-%d"),
-                    metrics="views",
-                    dimensions="video,insightTrafficSourceType",
-                    filters=f"video=={video_id}",
-                    sort="-views"
-                ).execute()
-                
-                # Find YT_SEARCH views
-                search_count = 0
-                if 'rows' in resp:
-                    for traffic_row in resp['rows']:
-                        _, source_type, views = traffic_row
-                        if source_type == 'YT_SEARCH':
-                            search_count = int(views)
-                            break
-                
-                if search_count > 0:
-                    search_views[video_id] = search_count
-    
-                
-            except Exception as e:
-                console.print(f"[red]  Error getting search traffic for {video_id}: {e}[/red]")
-        
-        return search_views
+        # Keep only YT_SEARCH views
+        search_views = breakdown.get('YT_SEARCH', pd.Series(dtype='int64'))
+        return search_views[search_views > 0].to_dict()
         
     except Exception as e:
         console.print(f"[red]Warning: Could not get search traffic views: {e}[/red]")
         return {}
 
-def get_organic_views(client, start_date, end_date, max_videos=30):
+def get_organic_views(client, start_date, end_date, max_videos=30, console=console):
     """Get organic (non-advertising) views for videos"""
     # Try the precise per-video method first, fallback to ratio-based
-    return get_organic_views_per_video(client, start_date, end_date, max_videos)
+    organic_views, _ = get_organic_views_per_video(client, start_date, end_date, max_videos,
+                                                   console=console)
+    return organic_views
+
+def get_organic_views_cached(client, start_date, end_date, max_videos=30, console=console):
+    """Get organic views, reusing a result computed earlier the same day
+    
+    Analytics data is daily, so a result stays valid until local midnight.
+    Only precise per-video results are cached; empty or approximated ones
+    (after an API failure) are recomputed next time.
+    """
+    account_id = account_cache_id()
+    if account_id is None:
+        return get_organic_views(client, start_date, end_date, max_videos, console=console)
+    
+    cache_key = make_cache_key(["organic", account_id, start_date, end_date, max_videos])
+    cached = get_db().get_report_cache(cache_key)
+    if cached is not None:
+        return cached
+    
+    organic_views, precise = get_organic_views_per_video(client, start_date, end_date, max_videos,
+                                                         console=console)
+    if organic_views and precise:
+        organic_views = {video_id: int(views) for video_id, views in organic_views.items()}
+        get_db().put_report_cache(cache_key, organic_views)
+    return organic_views
 
 def debug_traffic_sources(client, start_date, end_date):
     """Debug function to see what traffic sources exist"""
@@ -348,9 +677,8 @@ def debug_traffic_sources(client, start_date, end_date):
         
         if not traffic_df.empty:
             print("Available traffic sources:")
-            for _, row in traffic_df.iterrows():
-                source = row['insightTrafficSourceType']
-                views = int(row['views'])
+            for source, views in zip(traffic_df['insightTrafficSourceType'].tolist(),
+                                     traffic_df['views'].astype('int64').tolist()):
                 print(f"  {source}: {views:,} views")
         else:
             print("No traffic source data found")
@@ -379,47 +707,6 @@ def debug_traffic_sources(client, start_date, end_date):
     except Exception as e:
         print(f"Error getting advertising views: {e}")
 
-def get_search_keywords(client, start_date, end_date, max_results=20):
-    """Get top search keywords that led to views
-    
-    Note: As of 2025, the YouTube Analytics API no longer supports detailed
-    search keyword retrieval via insightTrafficSourceDetail dimension.
-    """
-    try:
-        yt_analytics = get_youtube_analytics_client()
-        if not yt_analytics:
-            console.print("[red]Cannot get search keywords without YouTube Analytics API[/red]")
-            return {}
-        
-        console.print("[dim]Getting top search keywords...[/dim]")
-        
-        # Get search keywords across all videos
-        resp = yt_analytics.reports().query(
-            ids=f"channel==MINE",
-            startDate=start_date.strftime("%Y-%m-%d"),
-            endDate=end_date.strftime("%Y-%m-%d"),
-            metrics="views",
-            dimensions="insightTrafficSourceDetail",
-            filters="insightTrafficSourceType==YT_SEARCH",
-            sort="-views"
-        ).execute()
-        
-        keywords = {}
-        if 'rows' in resp:
-            for row in resp['rows']:
-                keyword, views = row
-                if keyword and keyword != '(not provided)' and keyword.strip():
-                    keywords[keyword] = int(views)
-                    console.print(f"[dim]  '{keyword}': {views:,} views[/dim]")
-        
-        return keywords
-        
-    except Exception as e:
-        console.print(f"[yellow]⚠️  Search keywords not available via API[/yellow]")
-        console.print("[dim]YouTube Analytics API no longer supports search keyword details[/dim]")
-        console.print("[dim]Use YouTube Studio Analytics for search term data[/dim]")
-        return {}
-
 def get_video_keywords(client, video_id, start_date, end_date):
     """Get search keywords for a specific video"""
     try:
@@ -446,7 +733,8 @@ def get_video_keywords(client, video_id, start_date, end_date):
         
         for i, approach in enumerate(approaches):
             try:
-                resp = yt_analytics.reports().query(
+                resp = cached_analytics_query(
+                    yt_analytics,
                     ids=f"channel==MINE",
                     startDate=start_date.strftime("%Y-%m-%d"),
                     endDate=end_date.strftime("%Y-%m-%d"),
@@ -454,7 +742,7 @@ def get_video_keywords(client, video_id, start_date, end_date):
                     dimensions=approach["dimensions"],
                     filters=approach["filters"],
                     sort="-views"
-                ).execute()
+                )
                 
                 keywords = {}
                 if 'rows' in resp:
@@ -483,44 +771,27 @@ def get_video_keywords(client, video_id, start_date, end_date):
         console.print("[dim]Use YouTube Studio Analytics for detailed search term data[/dim]")
         return {}
 
-def show_search_keywords_report(client, start_date, end_date, max_results):
-    """Show top search keywords that led to views"""
-    
-    # Header
-    title = f"🔑 TOP {max_results} SEARCH KEYWORDS"
-    subtitle = f"{start_date} to {end_date}"
-    console.print(Panel(f"[bold yellow]{title}[/bold yellow]\n[dim]{subtitle}[/dim]", 
-                       box=box.ROUNDED, style="yellow"))
+def _make_table(columns):
+    """Create a report table with the given (header, options) columns"""
+    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
+
+def with_spinner(description, fn, *args, console=console):
+    """Call fn(*args) behind a progress spinner and return its result
     
-    # Get keywords with progress indicator
+    The spinner is skipped when the console isn't a terminal (piped
+    output, or a report buffered by run_reports).
+    """
+    if not console.is_terminal:
+        return fn(*args)
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), 
                   console=console) as progress:
-        task = progress.add_task("🔑 Getting top search keywords...", total=None)
-        keywords = get_search_keywords(client, start_date, end_date, max_results * 2)
+        task = progress.add_task(description, total=None)
+        result = fn(*args)
         progress.update(task, completed=100)
-    
-    if not keywords:
-        console.print("[dim]No search keywords found for the specified date range[/dim]")
-        return
-    
-    # Sort by views
-    sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:max_results]
-    
-    # Create table
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("Rank", style="dim", width=4)
-    table.add_column("Views", justify="right", style="yellow")
-    table.add_column("Search Keyword", style="white")
-    
-    for i, (keyword, views) in enumerate(sorted_keywords, 1):
-        table.add_row(
-            f"{i:2d}.",
-            f"{views:,}",
-            f"'{keyword}'"
-        )
-    
-    console.print(table)
-    console.print()
+    return result
 
 def show_latest_video_keywords_report(client, start_date, end_date, max_results=10):
     """Show search keywords for the latest video"""
@@ -532,31 +803,18 @@ def show_latest_video_keywords_report(client, start_date, end_date, max_results=
                        box=box.ROUNDED, style="purple"))
     
     # Get latest video (highest views in the period)
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), 
-                  console=console) as progress:
-        task = progress.add_task("🎯 Finding latest video and keywords...", total=None)
-        
-        # Get top video by views
-        total_report = client.fetch_report(
-            dimensions=("video",),
-            metrics=("views",),
-            start_date=start_date,
-            end_date=end_date,
-            sort_options=("-views",),
-            max_results=1,
-        )
-        total_df = total_report.to_pandas()
-        
-        if total_df.empty:
-            console.print("[dim]No videos found for the specified date range[/dim]")
-            return
-        
-        latest_video_id = total_df.iloc[0]['video']
-        progress.update(task, completed=100)
+    total_df = with_spinner("🎯 Finding latest video and keywords...", get_top_videos,
+                            client, start_date, end_date, 1)
+    
+    if total_df.empty:
+        console.print("[dim]No videos found for the specified date range[/dim]")
+        return
+    
+    latest_video_id = total_df.iloc[0]['video']
     
     # Get video info
     video_info = get_video_info([latest_video_id])
-    info = video_info.get(latest_video_id, {'title': "Title unavailable", 'date': "Unknown"})
+    info = video_info.get(latest_video_id, _UNKNOWN_INFO)
     
     # Show video details
     console.print(f"[bold white]Video:[/bold white] {info['title']} [dim]({info['date']})[/dim]")
@@ -573,31 +831,24 @@ def show_latest_video_keywords_report(client, start_date, end_date, max_results=
         return
     
     # Sort by views and limit results
-    sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:max_results]
+    sorted_keywords = heapq.nlargest(max_results, keywords.items(), key=itemgetter(1))
     
     # Create table
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("Rank", style="dim", width=4)
-    table.add_column("Views", justify="right", style="purple")
-    table.add_column("Search Keyword", style="white")
-    table.add_column("Type", style="cyan", width=8)
-    
-    branded_keywords_lower = [kw.lower() for kw in BRANDED_KEYWORDS]
+    table = _make_table(_LATEST_VIDEO_KEYWORD_COLUMNS)
     
     for i, (keyword, views) in enumerate(sorted_keywords, 1):
-        keyword_type = "🏷️ Branded" if keyword.lower() in branded_keywords_lower else "🔍 Organic"
-        table.add_row(
-            f"{i:2d}.",
-            f"{views:,}",
-            f"'{keyword}'",
-            keyword_type
-        )
+        kind = "🏷️ Branded" if keyword.lower() in BRANDED_KEYWORDS_SET else "🔍 Organic"
+        table.add_row(f"{i:2d}.", format(views, ','), Text(f"'{keyword}'"), kind)
     
     console.print(table)
     console.print()
 
-def get_search_keywords(client, start_date, end_date, max_results=20):
-    """Get top search keywords that led to views"""
+def get_search_keywords(client, start_date, end_date, max_results=20, console=console):
+    """Get top search keywords that led to views
+    
+    Note: As of 2025, the YouTube Analytics API no longer supports detailed
+    search keyword retrieval via insightTrafficSourceDetail dimension.
+    """
     try:
         yt_analytics = get_youtube_analytics_client()
         if not yt_analytics:
@@ -610,7 +861,8 @@ def get_search_keywords(client, start_date, end_date, max_results=20):
         
         for limit in limits_to_try:
             try:
-                resp = yt_analytics.reports().query(
+                resp = cached_analytics_query(
+                    yt_analytics,
                     ids=f"channel==MINE",
                     startDate=start_date.strftime("%Y-%m-%d"),
                     endDate=end_date.strftime("%Y-%m-%d"),
@@ -619,7 +871,7 @@ def get_search_keywords(client, start_date, end_date, max_results=20):
                     filters="insightTrafficSourceType==YT_SEARCH",
                     sort="-views",
                     maxResults=limit
-                ).execute()
+                )
                 
                 keywords = {}
                 if 'rows' in resp:
@@ -659,16 +911,12 @@ def get_video_views(client, start_date, end_date, max_videos=30):
         if total_df.empty:
             return {}
         
-        video_views = {}
-        for _, row in total_df.iterrows():
-            video_views[row['video']] = int(row['views'])
-        
-        return video_views
+        return dict(zip(total_df['video'].tolist(), total_df['views'].astype('int64').tolist()))
     except Exception as e:
         console.print(f"[red]Error getting video views: {e}[/red]")
         return {}
 
-def show_search_keywords_report(client, start_date, end_date, max_results):
+def show_search_keywords_report(client, start_date, end_date, max_results, console=console):
     """Show top search keywords that led to views"""
     
     # Header
@@ -678,11 +926,9 @@ def show_search_keywords_report(client, start_date, end_date, max_results):
                        box=box.ROUNDED, style="blue"))
     
     # Get keywords with progress indicator
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), 
-                  console=console) as progress:
-        task = progress.add_task("🔑 Getting top search keywords...", total=None)
-        keywords = get_search_keywords(client, start_date, end_date, max_results)
-        progress.update(task, completed=100)
+    keywords = with_spinner("🔑 Getting top search keywords...",
+                            functools.partial(get_search_keywords, console=console),
+                            client, start_date, end_date, max_results, console=console)
     
     if not keywords:
         console.print("[dim]No search keywords found for the specified date range[/dim]")
@@ -690,25 +936,18 @@ def show_search_keywords_report(client, start_date, end_date, max_results):
         return
     
     # Sort by views and limit results
-    sorted_keywords = sorted(keywords.items(), key=lambda x: x[1], reverse=True)[:max_results]
+    sorted_keywords = heapq.nlargest(max_results, keywords.items(), key=itemgetter(1))
     
     # Create table
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("Rank", style="dim", width=4)
-    table.add_column("Views", justify="right", style="purple")
-    table.add_column("Search Keyword", style="white")
+    table = _make_table(_KEYWORD_COLUMNS)
     
     for i, (keyword, views) in enumerate(sorted_keywords, 1):
-        table.add_row(
-            f"{i:2d}.",
-            f"{views:,}",
-            f"'{keyword}'"
-        )
+        table.add_row(f"{i:2d}.", format(views, ','), Text(f"'{keyword}'"))
     
     console.print(table)
     console.print()
 
-def show_search_traffic_report(client, start_date, end_date, max_results):
+def show_search_traffic_report(client, start_date, end_date, max_results, console=console):
     """Show top videos by YouTube search traffic"""
     
     # Header
@@ -718,21 +957,16 @@ def show_search_traffic_report(client, start_date, end_date, max_results):
                        box=box.ROUNDED, style="blue"))
     
     # Get search traffic views with progress indicator
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), 
-                  console=console) as progress:
-        task = progress.add_task("🔍 Getting YouTube search traffic...", total=None)
-        search_views = get_search_traffic_views(client, start_date, end_date, max_results * 3)
-        progress.update(task, completed=100)
+    search_views = with_spinner("🔍 Getting YouTube search traffic...",
+                                functools.partial(get_search_traffic_views, console=console),
+                                client, start_date, end_date, max_results * 3, console=console)
     
-    # Create list of videos with search views and sort
-    video_data = []
-    for video_id, search_count in search_views.items():
-        if search_count > 0:
-            video_data.append((video_id, search_count))
-    
-    # Sort by search views and take top results
-    video_data.sort(key=lambda x: x[1], reverse=True)
-    top_videos = video_data[:max_results]
+    # Take top results by search views, skipping videos without any
+    top_videos = heapq.nlargest(
+        max_results,
+        ((video_id, count) for video_id, count in search_views.items() if count > 0),
+        key=itemgetter(1)
+    )
     
     if not top_videos:
         console.print("[dim]No videos found with search traffic in the specified date range[/dim]")
@@ -740,35 +974,20 @@ def show_search_traffic_report(client, start_date, end_date, max_results):
     
     # Get video info (titles and dates)
     top_video_ids = [vid for vid, _ in top_videos]
-    video_info = get_video_info(top_video_ids)
+    video_info = get_video_info(top_video_ids, console=console)
     
     # Create table
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("Rank", style="dim", width=4)
-    table.add_column("Search Views", justify="right", style="blue")
-    table.add_column("Title", style="white")
-    table.add_column("Date", style="cyan", width=8)
-    table.add_column("Link", style="blue underline", width=30)
+    table = _make_table(_SEARCH_TRAFFIC_COLUMNS)
     
     for i, (video_id, search_count) in enumerate(top_videos, 1):
-        views = f"{search_count:,}"
-        info = video_info.get(video_id, {'title': "Title unavailable", 'date': "Unknown"})
-        title = info['title']
-        date = info['date']
-        link = f"youtube.com/watch?v={video_id}"
-        
-        table.add_row(
-            f"{i:2d}.",
-            views,
-            title,
-            date,
-            link
-        )
+        info = video_info.get(video_id, _UNKNOWN_INFO)
+        table.add_row(f"{i:2d}.", format(search_count, ','), Text(info['title']), info['date'],
+                      f"youtube.com/watch?v={video_id}")
     
     console.print(table)
     console.print()
 
-def show_organic_views_report(client, start_date, end_date, max_results):
+def show_organic_views_report(client, start_date, end_date, max_results, console=console):
     """Show top videos by organic views (excluding advertising)"""
     
     # Header
@@ -778,21 +997,16 @@ def show_organic_views_report(client, start_date, end_date, max_results):
                        box=box.ROUNDED, style="green"))
     
     # Get organic views with progress indicator
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), 
-                  console=console) as progress:
-        task = progress.add_task("📊 Calculating organic views (excluding advertising)...", total=None)
-        organic_views = get_organic_views(client, start_date, end_date, max_results * 3)
-        progress.update(task, completed=100)
+    organic_views = with_spinner("📊 Calculating organic views (excluding advertising)...",
+                                 functools.partial(get_organic_views_cached, console=console),
+                                 client, start_date, end_date, max_results * 3, console=console)
     
-    # Create list of videos with organic views and sort
-    video_data = []
-    for video_id, organic_count in organic_views.items():
-        if organic_count > 0:  # Only include videos with organic views
-            video_data.append((video_id, organic_count))
-    
-    # Sort by organic views and take top results
-    video_data.sort(key=lambda x: x[1], reverse=True)
-    top_videos = video_data[:max_results]
+    # Take top results by organic views, skipping videos without any
+    top_videos = heapq.nlargest(
+        max_results,
+        ((video_id, count) for video_id, count in organic_views.items() if count > 0),
+        key=itemgetter(1)
+    )
     
     if not top_videos:
         console.print("[dim]No videos found with organic views in the specified date range[/dim]")
@@ -800,64 +1014,80 @@ def show_organic_views_report(client, start_date, end_date, max_results):
     
     # Get video info (titles and dates)
     top_video_ids = [vid for vid, _ in top_videos]
-    video_info = get_video_info(top_video_ids)
+    video_info = get_video_info(top_video_ids, console=console)
     
     # Create table
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("Rank", style="dim", width=4)
-    table.add_column("Organic Views", justify="right", style="green")
-    table.add_column("Title", style="white")
-    table.add_column("Date", style="cyan", width=8)
-    table.add_column("Link", style="blue underline", width=30)
+    table = _make_table(_ORGANIC_COLUMNS)
     
     for i, (video_id, organic_count) in enumerate(top_videos, 1):
-        views = f"{organic_count:,}"
-        info = video_info.get(video_id, {'title': "Title unavailable", 'date': "Unknown"})
-        title = info['title']
-        date = info['date']
-        link = f"youtube.com/watch?v={video_id}"
-        
-        table.add_row(
-            f"{i:2d}.",
-            views,
-            title,
-            date,
-            link
-        )
+        info = video_info.get(video_id, _UNKNOWN_INFO)
+        table.add_row(f"{i:2d}.", format(organic_count, ','), Text(info['title']), info['date'],
+                      f"youtube.com/watch?v={video_id}")
     
     console.print(table)
     console.print()
 
+def capture_report(report, *args):
+    """Run a report against an in-memory console and return its rendered output"""
+    buffer = io.StringIO()
+    report_console = Console(file=buffer, width=console.width, color_system=console.color_system)
+    report(*args, console=report_console)
+    return buffer.getvalue()
+
+def run_reports(reports, client, start_date, end_date, max_results):
+    """Run reports concurrently and print their output in the given order
+    
+    The API calls of each report overlap on worker threads; each report
+    renders into its own buffer so output never interleaves. If a report
+    fails, the others are still printed before its error is re-raised.
+    """
+    if len(reports) <= 1:
+        for report in reports:
+            report(client, start_date, end_date, max_results)
+        return
+    
+    async def gather_reports():
+        return await asyncio.gather(*(
+            asyncio.to_thread(capture_report, report, client, start_date, end_date, max_results)
+            for report in reports
+        ), return_exceptions=True)
+    
+    outputs = with_spinner("📊 Running reports...", lambda: asyncio.run(gather_reports()))
+    errors = [output for output in outputs if isinstance(output, BaseException)]
+    for output in outputs:
+        if not isinstance(output, BaseException):
+            console.file.write(output)
+    console.file.flush()
+    if errors:
+        raise errors[0]
+
 def recent_top_videos(days=28, max_results=10):
     """Get top videos from the last N days with multiple report types"""
     client = get_client()
     
     # Calculate date range
-    end_date = datetime.now().date()
+    end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    # Show organic views report
-    show_organic_views_report(client, start_date, end_date, max_results)
-    
-    # Show search traffic report
-    show_search_traffic_report(client, start_date, end_date, max_results)
-    
-    # Show search keywords report
-    show_search_keywords_report(client, start_date, end_date, max_results)
+    # Organic views, search traffic and search keywords reports
+    run_reports([show_organic_views_report, show_search_traffic_report, show_search_keywords_report],
+                client, start_date, end_date, max_results)
 
 @click.command()
 @click.option("--start", help="Start date (YYYY-MM-DD)")
 @click.option("--end", help="End date (YYYY-MM-DD)")
-@click.option("--max", default=10, help="Maximum number of results")
+@click.option("--max", default=10, type=click.IntRange(min=1), help="Maximum number of results")
 @click.option("--days", default=28, help="Number of recent days (default mode)")
 @click.option("--organic", is_flag=True, help="Show only organic views report")
 @click.option("--search", is_flag=True, help="Show only search traffic report")  
 @click.option("--keywords", is_flag=True, help="Show only search keywords report")
-@click.option("--sync", help="Sync video data to database (provide video ID or 'recent' for recent videos)")
+@click.option("--sync", help="Sync video data to database (provide video ID, 'recent' for recent videos or 'stored' to refresh stored videos)")
 @click.option("--first-week", is_flag=True, help="Compare first week performance across recent videos")
 @click.option("--traffic-source", default="BROWSE", help="Traffic source for analysis (BROWSE, YT_SEARCH, ADVERTISING, etc.)")
 @click.option("--all", "show_all", is_flag=True, help="Show all reports (default)")
-def main(start, end, max, days, organic, search, keywords, sync, first_week, traffic_source, show_all):
+@click.option("--refresh-metadata", is_flag=True, help="Re-fetch cached video titles and publish dates")
+def main(start, end, max, days, organic, search, keywords, sync, first_week, traffic_source, show_all,
+         refresh_metadata):
     """🎬 YouTube Analytics Stats Tool
     
     Default: Shows comprehensive analytics from last 28 days
@@ -866,10 +1096,20 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
     
     Database features:
     --sync recent             Sync recent videos to database
+    --sync stored             Refresh metrics for all stored videos
     --sync VIDEO_ID          Sync specific video
     --first-week             Compare first week performance
     """
     
+    # Report mode: load (or refresh) the Analytics credentials in the
+    # background while the welcome panel renders. On a first run analytix
+    # hasn't written tokens.json yet, so there is nothing to load.
+    credentials_future = None
+    if not (sync or first_week) and os.path.exists("tokens.json"):
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        credentials_future = prefetch.submit(get_youtube_analytics_credentials)
+        prefetch.shutdown(wait=False)
+    
     # Welcome message
     console.print(Panel.fit(
         "[bold magenta]🎬 YouTube Analytics Stats Tool[/bold magenta]\n"
@@ -877,26 +1117,42 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
         border_style="magenta"
     ))
     
+    if refresh_metadata:
+        get_db().clear_video_metadata()
+    
     # Handle database operations first
     if sync:
-        db = YouTubeAnalyticsDB()
+        db = get_db()
         
         if sync.lower() == 'recent':
             console.print("[blue]Syncing recent videos to database...[/blue]")
             
             # Get recent videos from current API
             client = get_client()
-            end_date = datetime.now().date()
+            end_date = date.today()
             start_date = end_date - timedelta(days=30)
             video_views = get_video_views(client, start_date, end_date, 10)
             
-            for video_id in video_views.keys():
-                db.sync_video(video_id, days_back=60)
-                
-            console.print("[green]✅ Sync complete![/green]")
+            video_ids = list(video_views.keys())
+            with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
+                          BarColumn(), MofNCompleteColumn(), console=console,
+                          disable=not console.is_terminal) as progress:
+                task = progress.add_task("🔄 Syncing videos...", total=len(video_ids))
+                results = db.sync_videos(video_ids, days_back=60,
+                                         on_done=lambda video_id, success: progress.advance(task))
+            
+            synced = sum(results.values())
+            console.print(f"[green]✅ Sync complete! ({synced}/{len(video_ids)} videos)[/green]")
+        elif sync.lower() == 'stored':
+            console.print("[blue]Refreshing metrics for stored videos...[/blue]")
+            try:
+                db.sync_stored_videos(days_back=60)
+            except Exception as e:
+                console.print(f"[red]❌ Failed to refresh stored videos: {e}[/red]")
+            else:
+                console.print("[green]✅ Sync complete![/green]")
         else:
             # Sync specific video
-            db = YouTubeAnalyticsDB()
             if db.sync_video(sync, days_back=60):
                 console.print(f"[green]✅ Synced video {sync}![/green]")
             else:
@@ -904,7 +1160,7 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
         return
     
     if first_week:
-        db = YouTubeAnalyticsDB()
+        db = get_db()
         recent_videos = db.get_recent_videos(5)
         
         if not recent_videos:
@@ -918,11 +1174,12 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
         analysis = db.analyze_first_week_performance(recent_videos, traffic_source)
         
         # Create comparison table
-        table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-        table.add_column("Rank", style="dim", width=4)
-        table.add_column("Title", style="white", width=40)
-        table.add_column("Published", style="cyan", width=12)
-        table.add_column(f"First Week {traffic_source}", justify="right", style="green")
+        table = _make_table([
+            _RANK_COLUMN,
+            ("Title", {"style": "white", "width": 40}),
+            ("Published", {"style": "cyan", "width": 12}),
+            (f"First Week {traffic_source}", {"justify": "right", "style": "green"}),
+        ])
         
         # Sort by first week views
         sorted_videos = sorted(analysis.items(), 
@@ -930,11 +1187,12 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
                              reverse=True)
         
         for i, (video_id, data) in enumerate(sorted_videos, 1):
-            published = datetime.strptime(data['published_date'], '%Y-%m-%d').strftime('%b %d')
+            published_date = data['published_date']
+            title = data['title']
             table.add_row(
                 f"{i}.",
-                data['title'][:37] + "..." if len(data['title']) > 40 else data['title'],
-                published,
+                Text(title[:37] + "..." if len(title) > 40 else title),
+                f"{_MONTH_ABBR[published_date.month]} {published_date.day:02d}",
                 f"{data['first_week_views']:,}"
             )
         
@@ -942,8 +1200,12 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
         console.print()
         return
     
-    # Regular reporting mode
+    # Regular reporting mode; a failed prefetch surfaces here. Failed
+    # credentials aren't cached, so the reports retry and report it again.
     client = get_client()
+    if credentials_future is not None and credentials_future.exception() is not None:
+        console.print(f"[yellow]Warning: Could not load YouTube Analytics credentials: "
+                      f"{credentials_future.exception()}[/yellow]")
     
     if start and end:
         # Custom date range mode
@@ -951,22 +1213,29 @@ def main(start, end, max, days, organic, search, keywords, sync, first_week, tra
         end_date = datetime.strptime(end, "%Y-%m-%d").date()
     else:
         # Default mode: recent days
-        end_date = datetime.now().date()
+        end_date = date.today()
         start_date = end_date - timedelta(days=days)
     
     # Determine which reports to show
     if not any([organic, search, keywords]):
         show_all = True  # Default to all reports if none specified
     
-    # Show selected reports
+    reports = []
     if show_all or organic:
-        show_organic_views_report(client, start_date, end_date, max)
+        reports.append(show_organic_views_report)
     
     if show_all or search:
-        show_search_traffic_report(client, start_date, end_date, max)
+        reports.append(show_search_traffic_report)
     
     if show_all or keywords:
-        show_search_keywords_report(client, start_date, end_date, max)
+        reports.append(show_search_keywords_report)
+    
+    # Show selected reports
+    try:
+        run_reports(reports, client, start_date, end_date, max)
+    finally:
+        # Persist cached API responses once for the whole run
+        flush_query_cache()
     
     # Success message
     console.print(Panel(